@@ -1,3 +1,5 @@
+import functools
+
 import cirq
 
 """Simulate each of the circuits."""
@@ -38,17 +40,28 @@ def dj_circuit(oracle):
     yield cirq.measure(q3)
 
 
+@functools.lru_cache(maxsize=16)
+def _build_dj_circuit(oracle_ops):
+    # Frozen: the cached circuit is shared by every caller, so it must not be mutable
+    return cirq.FrozenCircuit(dj_circuit(list(oracle_ops)))
+
+
+def build_dj_circuit(oracle):
+    """Build the Deutsch-Jozsa circuit for an oracle once and reuse it for repeated queries."""
+    return _build_dj_circuit(tuple(cirq.flatten_to_ops(oracle)))
+
+
 """Simulate the Deutsch-Jozsa circuit and check the results."""
 print("Measurement on balanced function:")
-oracle = balanced[0]
+circuit_b = build_dj_circuit(balanced[0])
 print('Balanced Circuit:')
-print(cirq.Circuit(dj_circuit(oracle)))
-result = simulator.run(cirq.Circuit(dj_circuit(oracle)), repetitions=1)
+print(circuit_b)
+result = simulator.run(circuit_b, repetitions=1)
 print(f'Measurement result on balanced: q{result}')
 
 print("Measurement on constant function:")
-oracle = constant[0]
+circuit_c = build_dj_circuit(constant[0])
 print('\nConstant Circuit:')
-print(cirq.Circuit(dj_circuit(oracle)))
-result = simulator.run(cirq.Circuit(dj_circuit(oracle)), repetitions=1)
+print(circuit_c)
+result = simulator.run(circuit_c, repetitions=1)
 print(f'Measurement result on constant circuit: q{result}')
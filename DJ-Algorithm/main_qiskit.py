@@ -1,4 +1,8 @@
 # initialization
+import functools
+import os
+import sys
+import matplotlib.pyplot as plt
 import numpy as np
 
 # importing Qiskit
@@ -7,9 +11,21 @@ from qiskit import QuantumCircuit
 # import basic plot tools
 from qiskit.visualization import plot_histogram
 from qiskit_aer import AerSimulator
-from qiskit import transpile
 
-def dj_oracle(case, n):
+# Transpile cache shared by the scripts (lives at the repository root)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from transpile_cache import transpile_cached
+
+# Aer simulates this small circuit directly; set to False to transpile
+# (e.g. when targeting real hardware)
+SKIP_TRANSPILE = True
+
+# Set PLOT=0 to skip the matplotlib figures and print a text diagram instead
+# (e.g. for batched or CI runs)
+PLOT = os.getenv("PLOT", "1") == "1"
+
+@functools.lru_cache(maxsize=32)
+def _dj_oracle(case, n, output):
     # We need to make a QuantumCircuit object to return
     # This circuit has n+1 qubits: the size of the input,
     # plus one output qubit
@@ -22,9 +38,6 @@ def dj_oracle(case, n):
 
     # Case in which oracle is constant
     if case == "constant":
-        # First decide what the fixed output of the oracle will be
-        # (either always 0 or always 1)
-        output = np.random.randint(2)
         if output == 1:
             oracle_qc.x(n)
     
@@ -32,6 +45,19 @@ def dj_oracle(case, n):
     oracle_gate.name = "DJ-Oracle" # To show when we display the circuit
     return oracle_gate
 
+def dj_oracle(case, n, output=None):
+    # Oracle gates are built once per (case, n, output); each caller gets a
+    # copy, so renaming or relabelling it does not change the cached gate
+    if case == "constant":
+        # First decide what the fixed output of the oracle will be
+        # (either always 0 or always 1), at random unless given
+        if output is None:
+            output = np.random.randint(2)
+        output = int(output)
+    else:
+        output = None
+    return _dj_oracle(case, n, output).copy()
+
 def dj_algorithm(oracle, n):
     dj_circuit = QuantumCircuit(n+1, n)
     # Set up the output qubit:
@@ -51,17 +77,36 @@ def dj_algorithm(oracle, n):
     
     return dj_circuit
 
-n = 3
-oracle_gate = dj_oracle('balanced', n)
-dj_circuit = dj_algorithm(oracle_gate, n)
-dj_circuit.draw(filename="dj_circuit.png", output="mpl")
+def prepare_circuit(dj_circuit, qasm_sim):
+    # Return the circuit ready to run on the simulator (see SKIP_TRANSPILE)
+    if SKIP_TRANSPILE:
+        # Aer does not know our custom oracle gate, unroll only that one
+        return dj_circuit.decompose(gates_to_decompose=["DJ-Oracle"])
+    return transpile_cached(dj_circuit, qasm_sim)
+
+def main():
+    n = 3
+    oracle_gate = dj_oracle('balanced', n)
+    dj_circuit = dj_algorithm(oracle_gate, n)
+    if PLOT:
+        fig = dj_circuit.draw(output="mpl")
+        fig.savefig("dj_circuit.png", dpi=100, bbox_inches='tight', metadata={})
+        plt.close(fig)
+    else:
+        print(dj_circuit.draw(output="text"))
+
+    # Use Aer's simulator (updated for Qiskit 1.x)
+    qasm_sim = AerSimulator()
 
-# Use Aer's simulator (updated for Qiskit 1.x)
-qasm_sim = AerSimulator()
+    shots = 1
+    run_circuit = prepare_circuit(dj_circuit, qasm_sim)
+    results = qasm_sim.run(run_circuit, shots=shots).result()
+    answer = results.get_counts()
+    print('Results: ', answer)
+    if PLOT:
+        fig = plot_histogram(answer)
+        fig.savefig("dj_histogram.png", dpi=100, bbox_inches='tight', metadata={})
+        plt.close(fig)
 
-shots = 1
-transpiled_dj_circuit = transpile(dj_circuit, qasm_sim)
-results = qasm_sim.run(transpiled_dj_circuit, shots=shots).result()
-answer = results.get_counts()
-print('Results: ', answer)
-plot_histogram(answer, filename="dj_histogram.png")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,9 @@
 import cirq
+import numpy as np
+
+# The 50/50 split is computed exactly from the final state vector.
+# Set to True to also sample the circuit (e.g. to study shot noise)
+SAMPLE_SHOTS = False
 
 # Create a circuit
 circuit = cirq.Circuit()
@@ -10,19 +15,27 @@ circuit = cirq.Circuit()
 # CNOT to second keeping first as control and second as target
 circuit.append([cirq.H(q0), cirq.CNOT(q0, q1)])
 
-# Add measurement step to both qubits
-circuit.append([cirq.measure(q0), cirq.measure(q1)])
+# Exact probabilities from the amplitudes (before adding measurements)
+simulator = cirq.Simulator()
+state_vector = simulator.simulate(circuit).final_state_vector
+probabilities = np.abs(state_vector)**2
+
+print("Probabilities:")
+for index, probability in enumerate(probabilities):
+    print(f"|{index:02b}>: {probability:.3f}")
+
+if SAMPLE_SHOTS:
+    # Add measurement step to both qubits
+    circuit.append([cirq.measure(q0), cirq.measure(q1)])
 
 # Draw the circuit
 print("Circuit:")
 print(circuit)
 
-# Get a simulator to run this circuit
-simulator = cirq.Simulator()
-
-# Simulate the circuit several times
-result = simulator.run(circuit, repetitions=20)
+if SAMPLE_SHOTS:
+    # Simulate the circuit several times
+    result = simulator.run(circuit, repetitions=20)
 
-# Display the results
-print("Results:")
-print(result)
\ No newline at end of file
+    # Display the results
+    print("Results:")
+    print(result)
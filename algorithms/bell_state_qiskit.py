@@ -7,62 +7,119 @@ using IBM's Qiskit framework. The Bell state is: (|00> + |11>) / sqrt(2)
 Updated for Qiskit 1.x and qiskit-aer 0.17+
 """
 
+import os
+import sys
 import numpy as np
-from qiskit import QuantumCircuit, transpile
+from qiskit import QuantumCircuit
+from qiskit.quantum_info import Statevector
 from qiskit_aer import AerSimulator
 from qiskit.visualization import plot_histogram
 import matplotlib.pyplot as plt
 
-# Use Aer's simulator (updated for Qiskit 1.x)
-simulator = AerSimulator()
-
-# Create a Quantum Circuit acting on 2 qubits with 2 classical bits for measurement
-circuit = QuantumCircuit(2, 2)
-
-# Add a H gate on qubit 0
-circuit.h(0)
-
-# Add a CX (CNOT) gate on control qubit 0 and target qubit 1
-circuit.cx(0, 1)
-
-# Map the quantum measurement to the classical bits
-circuit.measure([0, 1], [0, 1])
-
-print("="*70)
-print("BELL STATE CREATION WITH QISKIT")
-print("="*70)
-print("\nQuantum Circuit:")
-print(circuit.draw(output='text'))
-
-# Compile the circuit for the simulator
-# (transpile optimizes the circuit for the backend)
-compiled_circuit = transpile(circuit, simulator)
-
-# Execute the circuit on the simulator with 1000 shots
-print("\nExecuting circuit with 1000 shots...")
-job = simulator.run(compiled_circuit, shots=1000)
-
-# Grab results from the job
-result = job.result()
-
-# Get measurement counts
-counts = result.get_counts(circuit)
-print("\n" + "="*70)
-print("MEASUREMENT RESULTS")
-print("="*70)
-print(f"\nTotal counts: {counts}")
-print(f"\nState |00>: {counts.get('00', 0)} times ({counts.get('00', 0)/10:.1f}%)")
-print(f"State |11>: {counts.get('11', 0)} times ({counts.get('11', 0)/10:.1f}%)")
-print("\nExpected: ~50% |00> and ~50% |11> (Bell state)")
-print("="*70)
-
-# Optional: Create histogram visualization
-try:
-    print("\nGenerating histogram visualization...")
-    fig = plot_histogram(counts)
-    plt.savefig('bell_state_histogram.png', dpi=300, bbox_inches='tight')
-    print("Histogram saved as 'bell_state_histogram.png'")
-except Exception as e:
-    print(f"Note: Could not save histogram visualization: {e}")
-
-print("\n✅ Bell state successfully created and measured!")
+# Transpile cache shared by the scripts (lives at the repository root)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from transpile_cache import transpile_cached
+
+# Aer simulates H/CX directly, so transpiling this circuit is pure overhead.
+# Set to False to transpile (e.g. when targeting real hardware)
+SKIP_TRANSPILE = True
+
+# The 50/50 split is computed exactly from the state vector. Set to True to
+# sample 1000 shots on Aer instead (e.g. to study shot noise)
+SAMPLE_SHOTS = False
+
+# Set PLOT=0 to skip the histogram (e.g. for batched or CI runs)
+PLOT = os.getenv("PLOT", "1") == "1"
+
+def build_bell_circuit():
+    """Create the 2-qubit Bell-state circuit with measurements on both qubits."""
+    # Create a Quantum Circuit acting on 2 qubits with 2 classical bits for measurement
+    circuit = QuantumCircuit(2, 2)
+
+    # Add a H gate on qubit 0
+    circuit.h(0)
+
+    # Add a CX (CNOT) gate on control qubit 0 and target qubit 1
+    circuit.cx(0, 1)
+
+    # Map the quantum measurement to the classical bits
+    circuit.measure([0, 1], [0, 1])
+    return circuit
+
+
+def prepare_circuit(circuit, simulator):
+    """Return the circuit ready to run on the simulator (see SKIP_TRANSPILE)."""
+    # Compile the circuit for the simulator
+    # (transpile optimizes the circuit for the backend; cached across runs)
+    if SKIP_TRANSPILE:
+        return circuit
+    return transpile_cached(circuit, simulator)
+
+
+def exact_probabilities(circuit):
+    """Return the exact outcome probabilities of the circuit, e.g. {'00': 0.5, '11': 0.5}."""
+    state = Statevector.from_instruction(circuit.remove_final_measurements(inplace=False))
+    return {str(outcome): float(probability) for outcome, probability in state.probabilities_dict().items()}
+
+
+def main():
+    # Use Aer's simulator (updated for Qiskit 1.x)
+    simulator = AerSimulator()
+
+    circuit = build_bell_circuit()
+
+    print("="*70)
+    print("BELL STATE CREATION WITH QISKIT")
+    print("="*70)
+    print("\nQuantum Circuit:")
+    print(circuit.draw(output='text'))
+
+    if SAMPLE_SHOTS:
+        compiled_circuit = prepare_circuit(circuit, simulator)
+
+        # Execute the circuit on the simulator with 1000 shots
+        print("\nExecuting circuit with 1000 shots...")
+        job = simulator.run(compiled_circuit, shots=1000)
+
+        # Grab results from the job
+        result = job.result()
+
+        # Get measurement counts
+        counts = result.get_counts(circuit)
+        print("\n" + "="*70)
+        print("MEASUREMENT RESULTS")
+        print("="*70)
+        print(f"\nTotal counts: {counts}")
+        print(f"\nState |00>: {counts.get('00', 0)} times ({counts.get('00', 0)/10:.1f}%)")
+        print(f"State |11>: {counts.get('11', 0)} times ({counts.get('11', 0)/10:.1f}%)")
+        print("\nExpected: ~50% |00> and ~50% |11> (Bell state)")
+        print("="*70)
+    else:
+        # Exact probabilities from the amplitudes, no sampling job needed
+        counts = exact_probabilities(circuit)
+        print("\n" + "="*70)
+        print("EXACT PROBABILITIES")
+        print("="*70)
+        print(f"\nProbabilities: {counts}")
+        print(f"\nState |00>: {counts.get('00', 0)*100:.1f}%")
+        print(f"State |11>: {counts.get('11', 0)*100:.1f}%")
+        print("\nExpected: 50% |00> and 50% |11> (Bell state)")
+        print("="*70)
+
+    # Optional: Create histogram visualization
+    if PLOT:
+        try:
+            print("\nGenerating histogram visualization...")
+            fig = plot_histogram(counts)
+            fig.savefig('bell_state_histogram.png', dpi=100, bbox_inches='tight', metadata={})
+            plt.close(fig)
+            print("Histogram saved as 'bell_state_histogram.png'")
+        except Exception as e:
+            print(f"Note: Could not save histogram visualization: {e}")
+
+    print("\n✅ Bell state successfully created and measured!" if SAMPLE_SHOTS
+          else "\n✅ Bell state successfully created!")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,27 @@
 #initialization
 import os
+import sys
 import matplotlib.pyplot as plt
 import numpy as np
 
 # importing Qiskit
-from qiskit import transpile
 from qiskit import QuantumCircuit, ClassicalRegister, QuantumRegister
 from qiskit_aer import Aer
 
 # import basic plot tools
 from qiskit.visualization import plot_histogram, circuit_drawer
 
+# Transpile cache shared by the scripts (lives at the repository root)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from transpile_cache import transpile_cached
+
+# Aer simulates initialize/mcx natively; set to False to transpile
+# (e.g. when targeting real hardware)
+SKIP_TRANSPILE = True
+
+# Set PLOT=0 to skip the histogram (e.g. for batched or CI runs)
+PLOT = os.getenv("PLOT", "1") == "1"
+
 
 clause_list = [[0,1],
                [0,2],
@@ -30,6 +41,7 @@ def diffuser(nqubits):
     for qubit in range(nqubits):
         qc.x(qubit)
     # Do multi-controlled-Z gate
+    # (H-MCX-H synthesizes to fewer CX than mcp(pi, ...): 14 vs 20 for nqubits=4)
     qc.h(nqubits-1)
     qc.mcx(list(range(nqubits-1)), nqubits-1)  # multi-controlled-x
     qc.h(nqubits-1)
@@ -44,110 +56,152 @@ def diffuser(nqubits):
     U_s.name = "U$_s$"
     return U_s
 
-# We will use separate registers to name the bits
-in_qubits = QuantumRegister(2, name='input')
-out_qubit = QuantumRegister(1, name='output')
-qc = QuantumCircuit(in_qubits, out_qubit)
-XOR(qc, in_qubits[0], in_qubits[1], out_qubit)
-qc.draw()
-
-
-# Create separate registers to name bits
-var_qubits = QuantumRegister(4, name='v')  # variable bits
-clause_qubits = QuantumRegister(4, name='c')  # bits to store clause-checks
-
-# Create quantum circuit
-qc = QuantumCircuit(var_qubits, clause_qubits)
-
-# Use XOR gate to check each clause
-i = 0
-for clause in clause_list:
-    XOR(qc, clause[0], clause[1], clause_qubits[i])
-    i += 1
+def clause_checks(clause_list):
+    var_qubits = QuantumRegister(4, name='v')
+    clause_qubits = QuantumRegister(4, name='c')
+    qc = QuantumCircuit(var_qubits, clause_qubits, name="Clauses")
 
-qc.draw()
-
-# Create separate registers to name bits
-var_qubits = QuantumRegister(4, name='v')
-clause_qubits = QuantumRegister(4, name='c')
-output_qubit = QuantumRegister(1, name='out')
-qc = QuantumCircuit(var_qubits, clause_qubits, output_qubit)
-
-# Compute clauses
-i = 0
-for clause in clause_list:
-    XOR(qc, clause[0], clause[1], clause_qubits[i])
-    i += 1
+    # Use XOR gate to check each clause
+    i = 0
+    for clause in clause_list:
+        XOR(qc, clause[0], clause[1], clause_qubits[i])
+        i += 1
 
-# Flip 'output' bit if all clauses are satisfied
-qc.mcx(clause_qubits, output_qubit)
+    # Return all clause checks as a single gate
+    return qc.to_gate(label="Clauses")
 
-qc.draw()
+def sudoku_oracle(clause_list):
+    var_qubits = QuantumRegister(4, name='v')
+    clause_qubits = QuantumRegister(4, name='c')
+    output_qubit = QuantumRegister(1, name='out')
+    qc = QuantumCircuit(var_qubits, clause_qubits, output_qubit, name="SudokuOracle")
+    clause_block = clause_checks(clause_list)
 
+    # Compute clauses
+    qc.append(clause_block, var_qubits[:] + clause_qubits[:])
 
-var_qubits = QuantumRegister(4, name='v')
-clause_qubits = QuantumRegister(4, name='c')
-output_qubit = QuantumRegister(1, name='out')
-cbits = ClassicalRegister(4, name='cbits')
-qc = QuantumCircuit(var_qubits, clause_qubits, output_qubit, cbits)
+    # Flip 'output' bit if all clauses are satisfied
+    # (the default ancilla-free synthesis needs 18 CX; a dirty v-chain over the
+    # variable qubits needs 26, and Aer runs mcx natively anyway)
+    qc.mcx(clause_qubits, output_qubit)
 
-def sudoku_oracle(qc, clause_list, clause_qubits):
-    # Compute clauses
+    # Uncompute clauses to reset clause-checking bits to 0
+    qc.append(clause_block.inverse(), var_qubits[:] + clause_qubits[:])
+
+    # We will return the oracle as a gate, built once and reused by every iteration
+    return qc.to_gate(label="SudokuOracle")
+
+# Build the oracle and diffuser once; every circuit below appends these gates
+oracle_gate = sudoku_oracle(clause_list)
+diffuser_gate = diffuser(4)
+
+def build_grover_circuit():
+    # Two Grover iterations over the sudoku oracle
+    var_qubits = QuantumRegister(4, name='v')
+    clause_qubits = QuantumRegister(4, name='c')
+    output_qubit = QuantumRegister(1, name='out')
+    cbits = ClassicalRegister(4, name='cbits')
+    qc = QuantumCircuit(var_qubits, clause_qubits, output_qubit, cbits)
+
+    # Initialize 'out0' in state |->
+    qc.initialize([1, -1]/np.sqrt(2), output_qubit)
+
+    # Initialize qubits in state |s>
+    qc.h(var_qubits)
+    qc.barrier()  # for visual separation
+
+    ## First Iteration
+    # Apply our oracle
+    qc.append(oracle_gate, range(9))
+    qc.barrier()  # for visual separation
+    # Apply our diffuser
+    qc.append(diffuser_gate, [0,1,2,3])
+
+    ## Second Iteration
+    qc.append(oracle_gate, range(9))
+    qc.barrier()  # for visual separation
+    # Apply our diffuser
+    qc.append(diffuser_gate, [0,1,2,3])
+
+    # Measure the variable qubits
+    qc.measure(var_qubits, cbits)
+    return qc
+
+def prepare_circuit(qc, aer_simulator):
+    # Return the circuit ready to run on the simulator (see SKIP_TRANSPILE)
+    if SKIP_TRANSPILE:
+        # Aer does not know our custom oracle/diffuser gates, unroll only those
+        # (two levels: the oracle contains the Clauses block and its inverse)
+        return qc.decompose(gates_to_decompose=["SudokuOracle", "U$_s$", "Clauses", "Clauses_dg"], reps=2)
+    return transpile_cached(qc, aer_simulator)
+
+def main():
+    # We will use separate registers to name the bits
+    in_qubits = QuantumRegister(2, name='input')
+    out_qubit = QuantumRegister(1, name='output')
+    qc = QuantumCircuit(in_qubits, out_qubit)
+    XOR(qc, in_qubits[0], in_qubits[1], out_qubit)
+    qc.draw()
+
+
+    # Create separate registers to name bits
+    var_qubits = QuantumRegister(4, name='v')  # variable bits
+    clause_qubits = QuantumRegister(4, name='c')  # bits to store clause-checks
+
+    # Create quantum circuit
+    qc = QuantumCircuit(var_qubits, clause_qubits)
+
+    # Use XOR gate to check each clause
     i = 0
     for clause in clause_list:
         XOR(qc, clause[0], clause[1], clause_qubits[i])
         i += 1
 
-    # Flip 'output' bit if all clauses are satisfied
-    qc.mcx(clause_qubits, output_qubit)
+    qc.draw()
 
-    # Uncompute clauses to reset clause-checking bits to 0
+    # Create separate registers to name bits
+    var_qubits = QuantumRegister(4, name='v')
+    clause_qubits = QuantumRegister(4, name='c')
+    output_qubit = QuantumRegister(1, name='out')
+    qc = QuantumCircuit(var_qubits, clause_qubits, output_qubit)
+
+    # Compute clauses
     i = 0
     for clause in clause_list:
         XOR(qc, clause[0], clause[1], clause_qubits[i])
         i += 1
 
-sudoku_oracle(qc, clause_list, clause_qubits)
-qc.draw()
-
+    # Flip 'output' bit if all clauses are satisfied
+    qc.mcx(clause_qubits, output_qubit)
 
-var_qubits = QuantumRegister(4, name='v')
-clause_qubits = QuantumRegister(4, name='c')
-output_qubit = QuantumRegister(1, name='out')
-cbits = ClassicalRegister(4, name='cbits')
-qc = QuantumCircuit(var_qubits, clause_qubits, output_qubit, cbits)
+    qc.draw()
 
-# Initialize 'out0' in state |->
-qc.initialize([1, -1]/np.sqrt(2), output_qubit)
 
-# Initialize qubits in state |s>
-qc.h(var_qubits)
-qc.barrier()  # for visual separation
+    var_qubits = QuantumRegister(4, name='v')
+    clause_qubits = QuantumRegister(4, name='c')
+    output_qubit = QuantumRegister(1, name='out')
+    cbits = ClassicalRegister(4, name='cbits')
+    qc = QuantumCircuit(var_qubits, clause_qubits, output_qubit, cbits)
 
-## First Iteration
-# Apply our oracle
-sudoku_oracle(qc, clause_list, clause_qubits)
-qc.barrier()  # for visual separation
-# Apply our diffuser
-qc.append(diffuser(4), [0,1,2,3])
+    qc.append(oracle_gate, range(9))
+    qc.draw()
 
-## Second Iteration
-sudoku_oracle(qc, clause_list, clause_qubits)
-qc.barrier()  # for visual separation
-# Apply our diffuser
-qc.append(diffuser(4), [0,1,2,3])
 
-# Measure the variable qubits
-qc.measure(var_qubits, cbits)
+    qc = build_grover_circuit()
+    qc.draw(fold=-1)
 
-qc.draw(fold=-1)
+    # Simulate and plot results
+    aer_simulator = Aer.get_backend('aer_simulator')
+    transpiled_qc = prepare_circuit(qc, aer_simulator)
+    result = aer_simulator.run(transpiled_qc).result()
 
-# Simulate and plot results
-aer_simulator = Aer.get_backend('aer_simulator')
-transpiled_qc = transpile(qc, aer_simulator)
-result = aer_simulator.run(transpiled_qc).result()
+    if PLOT:
+        os.makedirs("output", exist_ok=True)
+        fig = plot_histogram(result.get_counts())
+        fig.savefig('output/my_circuit.png', dpi=100, bbox_inches='tight', metadata={})
+        plt.close(fig)
+    else:
+        print(result.get_counts())
 
-os.makedirs("output", exist_ok=True)
-fig = plot_histogram(result.get_counts())
-fig.savefig('output/my_circuit.png')
-fig.show()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,79 @@
+"""
+Surface plot of a two-parameter cost function with the optimizer trajectory.
+
+cost_func is evaluated on a 200 x 200 grid with one broadcasted call, so the
+device behind it should support parameter broadcasting natively.
+default.qubit does; the compiled simulators split a broadcasted batch into
+one execution per grid point and are slower for small circuits like the
+2-qubit example in hello_pennylane.ipynb. For wider circuits switch the
+QNode device to the C++ or CUDA backend:
+
+    pip install pennylane-lightning          # qml.device("lightning.qubit", wires=n)
+    pip install pennylane-lightning[gpu]     # qml.device("lightning.gpu", wires=n)
+
+and use diff_method="adjoint" when the QNode returns expectation values
+(adjoint differentiation does not support qml.probs).
+
+When the cost has a closed form, pass it as `cost_kernel`, a Numba-compiled
+scalar function f(theta1, theta2); the grid is then filled by a parallel
+Numba loop over all cores and cost_func is not evaluated at all:
+
+    @numba.njit
+    def cost_kernel(t1, t2):
+        p0 = math.cos(t1 / 2)**2
+        return (p0 - 0.5)**2 + (1 - p0)**2 + 0.25
+
+    plot_opt_surface(cost_arr, param_arr, cost, cost_kernel=cost_kernel)
+"""
+
+import numpy as onp
 import pennylane as qml
 from pennylane import numpy as np
 from matplotlib import pyplot as plt
 
-def plot_opt_surface(costs, params, cost_func):
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+if njit is not None:
+    @njit(parallel=True)
+    def _surface(cost_kernel, theta1, theta2, out):
+        # One grid row per theta2 value, rows spread over the available cores
+        for i in prange(theta2.shape[0]):
+            for j in range(theta1.shape[0]):
+                out[i, j] = cost_kernel(theta1[j], theta2[i])
+        return out
+
+def plot_opt_surface(costs, params, cost_func, cost_kernel=None):
 
     n = 200
     theta1 = np.linspace(-2*np.pi, 2*np.pi, n)
     theta2 = np.linspace(-2*np.pi, 2*np.pi, n)
     # Grid of elements
     X, Y = np.meshgrid(theta1, theta2)
-    # Cost function on grid
-    z = []
-    for y in Y:
-        for x in X[0]:
-            z.append(cost_func([x, y[0]]))
-    Z = np.reshape(z, (n, n))
+    if cost_kernel is not None:
+        if njit is None:
+            raise ImportError("cost_kernel requires numba: pip install numba")
+        # Closed-form cost: fill the grid in compiled, parallel code
+        Z = _surface(cost_kernel, onp.asarray(theta1), onp.asarray(theta2), onp.empty((n, n)))
+    else:
+        # Flat list of (theta1, theta2) pairs, row-major over the grid
+        params_grid = np.stack([X.ravel(), Y.ravel()], axis=1)
+        # Cost function on grid: evaluate all points in one broadcasted call
+        # (PennyLane parameter broadcasting), one row of the grid per theta2
+        try:
+            Z = cost_func(params_grid.T)
+        except (TypeError, ValueError):
+            # cost_func cannot take batched parameters
+            Z = None
+        if Z is not None and np.shape(Z) == (n * n,):
+            Z = np.reshape(Z, (n, n))
+        else:
+            # cost_func cannot be broadcast (or reduces over the batch),
+            # fall back to point-wise evaluation
+            Z = np.fromiter((cost_func([x, y]) for x, y in params_grid),
+                            dtype=float, count=n * n).reshape(n, n)
 
     #Plotting the cost function of grid
     fig = plt.figure(figsize = (10, 10))
@@ -29,4 +88,4 @@ def plot_opt_surface(costs, params, cost_func):
     ax.set_xlabel(r'$\theta_1$')
     ax.set_ylabel(r'$\theta_2$')
     ax.set_title(r'Optimization of Quantum Circuit Using Adam Optimizer')
-    ax.legend(('Grid of cost function', 'Optimization results'))  
\ No newline at end of file
+    ax.legend(('Grid of cost function', 'Optimization results'))
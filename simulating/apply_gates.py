@@ -1,65 +1,66 @@
-import numpy as np
+from backend import DTYPE, apply_matrix, constant, xp
+
+# States are flat DTYPE (complex64) vectors: no artificial (2, 1) column dimension,
+# so every gate application is a matrix-vector product on contiguous memory
+# and xp.kron of two states is a plain 1-D tensor product.
+# Gate matrices are read-only module constants in the same precision.
+PAULI_X = constant([[0, 1], [1, 0]])
+HADAMARD = constant([[1/xp.sqrt(2), 1/xp.sqrt(2)],[1/xp.sqrt(2), -1/xp.sqrt(2)]])
+
+# Define CNOT gate matrices
+CNOT_1 = constant([[1, 0, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0], [0, 1, 0, 0]]) # first qubit target, second qubit control
+
+CNOT_2 = constant([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]]) # first qubit control, second qubit target
 
 # Define a simple quantum gate (Pauli-X gate) and apply it to a qubit state
-state_vector = np.array([[1, 0]]).T
+state_vector = xp.array([1, 0], dtype=DTYPE)
 # print("Initial State: ")
 # print(state_vector)
 
-pauli_x = np.array([[0, 1], [1, 0]])
 # print("Applying the Pauli-X Gate, defined as follows: ")
-# print(pauli_x)
+# print(PAULI_X)
 
-final_state = np.dot(pauli_x, state_vector) # taking the product of the gate and state vector 
+final_state = xp.dot(PAULI_X, state_vector) # taking the product of the gate and state vector 
 print("The final state after application is: ")
 print(final_state)
 
-# Define a Hadamard gate and apply it to a qubit state to create superposition
-state_vector = np.array([[1, 0]]).T
-hadamard_gate = np.array([[1/np.sqrt(2), 1/np.sqrt(2)],[1/np.sqrt(2), -1/np.sqrt(2)]])
+# Apply a Hadamard gate to a qubit state to create superposition
+state_vector = xp.array([1, 0], dtype=DTYPE)
 
-superposition = np.dot(hadamard_gate, state_vector)
+superposition = xp.dot(HADAMARD, state_vector)
 print("Superposition state: ")
 print(superposition)
 
-# Define CNOT gate matrices
-cnot_1 = np.array([[1, 0, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0], [0, 1, 0, 0]]) # first qubit target, second qubit control
-
-cnot_2 = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]]) # first qubit control, second qubit target
 
-
-state_vector = np.kron(np.array([[1, 0]]), np.array([[0, 1]])).T
+state_vector = xp.kron(xp.array([1, 0], dtype=DTYPE), xp.array([0, 1], dtype=DTYPE))
 print("Input: ")
 print(state_vector)
 
-# Resizing single-qubit gates#
-pauli_x = np.array([[0,1],[1,0]])
-print("Operator before growing: ")
-print(pauli_x)
-
-#starting tensor product with identity or the gate itself
-operator = np.identity(2)
+# Applying single-qubit gates to larger systems
+print("Single-qubit operator: ")
+print(PAULI_X)
 
-current = operator
 
-for qubit in range(1, 3):
-  if qubit == 1:
-      #tensor product with identity
-      current = np.kron(current, operator)
-      print('here')
-  else:
-      #tensor product with the gate
-      current = np.kron(current, pauli_x)
+def apply_1q(gate, state, target, n):
+  """
+  Apply a 2x2 gate to qubit `target` of an n-qubit state vector.
 
-print("Operator after growing: ")
-print(current)
+  Equivalent to growing the gate to I (x) ... (x) gate (x) ... (x) I with xp.kron
+  and multiplying, but the state is viewed as an n-dimensional (2, ..., 2) tensor
+  and only the target axis is contracted: O(2^n) memory and work instead of
+  materializing a 2^n x 2^n operator. With QSIM_GPU=1 this runs on the GPU
+  (cuStateVec when available, see backend.py).
+  """
+  return apply_matrix(gate, state, [target], n)
 
 
-zero = np.array([[1, 0]]).T
+zero = xp.array([1, 0], dtype=DTYPE)
 
-state_vector = np.kron(zero, np.kron(zero, zero))
+state_vector = xp.kron(zero, xp.kron(zero, zero))
 print("Initial State: ")
 print(state_vector)
 
-final = np.dot(current, state_vector)
+# Same result as growing I (x) I (x) X into an 8x8 operator and applying it
+final = apply_1q(PAULI_X, state_vector, target=2, n=3)
 print("Result after applying our operator: ")
-print(final)
\ No newline at end of file
+print(final)
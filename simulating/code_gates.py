@@ -1,41 +1,103 @@
 # Simulating Quantum Gates in Python
 import numpy as np
 import math
+from backend import GPU, constant, xp
+# Numba is optional: without it njit is a no-op and the kernels below run as plain NumPy
+from _kernels import njit
 
-# Basis states |0> and |1>
-zero = np.array([[1, 0]]).T
-one = np.array([[0, 1]]).T
+# Basis states |0> and |1> as flat DTYPE (complex64) vectors (no (2, 1) column
+# shape, so gate @ state is a plain matrix-vector product over contiguous memory).
+# All constants are built once at import and are read-only.
+ZERO = constant([1, 0])
+ONE = constant([0, 1])
 
 # Single-qubit gates (2x2 matrices)
-identity = np.eye(2)
-pauli_x = np.array([[0, 1], [1, 0]])
-pauli_y = np.array([[0, -1j], [1j, 0]])
-pauli_z = np.array([[1, 0], [0, -1]])
-hadamard = (1 / math.sqrt(2)) * np.array([[1, 1], [1, -1]])
+IDENTITY = constant([[1, 0], [0, 1]])
+PAULI_X = constant([[0, 1], [1, 0]])
+PAULI_Y = constant([[0, -1j], [1j, 0]])
+PAULI_Z = constant([[1, 0], [0, -1]])
+HADAMARD = constant([[1 / math.sqrt(2), 1 / math.sqrt(2)], [1 / math.sqrt(2), -1 / math.sqrt(2)]])
 
 
-cnot_1 = np.array([[1, 0, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0], [0, 1, 0, 0]]) # first qubit target, second qubit control
+CNOT_1 = constant([[1, 0, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0], [0, 1, 0, 0]]) # first qubit target, second qubit control
 
-cnot_2 = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]]) # first qubit control, second qubit target
+CNOT_2 = constant([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]]) # first qubit control, second qubit target
+
+
+@njit(cache=True, fastmath=True)
+def _apply_kernel(gate: np.ndarray, state: np.ndarray) -> np.ndarray:
+	# Flat contiguous operands: the product is a BLAS matrix-vector call (gemv)
+	state = np.ascontiguousarray(state).ravel()
+	gate = np.ascontiguousarray(gate)
+	dim = gate.shape[0]
+	# 1- and 2-qubit gates: inline the product, call overhead dominates at this size.
+	# Numba lowers the complex products to real multiply-adds itself, so the
+	# interleaved layout costs nothing here (see apply_split for large states)
+	if dim == 2:
+		s0, s1 = state[0], state[1]
+		return np.array([gate[0, 0] * s0 + gate[0, 1] * s1,
+						 gate[1, 0] * s0 + gate[1, 1] * s1])
+	if dim == 4:
+		s0, s1, s2, s3 = state[0], state[1], state[2], state[3]
+		return np.array([gate[0, 0] * s0 + gate[0, 1] * s1 + gate[0, 2] * s2 + gate[0, 3] * s3,
+						 gate[1, 0] * s0 + gate[1, 1] * s1 + gate[1, 2] * s2 + gate[1, 3] * s3,
+						 gate[2, 0] * s0 + gate[2, 1] * s1 + gate[2, 2] * s2 + gate[2, 3] * s3,
+						 gate[3, 0] * s0 + gate[3, 1] * s1 + gate[3, 2] * s2 + gate[3, 3] * s3])
+	return gate @ state
 
 
 def apply(gate: np.ndarray, state: np.ndarray) -> np.ndarray:
 	"""Apply a gate matrix to a state vector (supports 1+ qubits)."""
-	return gate @ state
+	if GPU:
+		# CuPy arrays stay on the device; Numba cannot compile for them
+		return gate @ state.ravel()
+	# Numba's @ needs one complex dtype for both operands (e.g. int gates, or
+	# a complex64 constant applied to a complex128 state)
+	dtype = np.result_type(gate, state, np.complex64)
+	return _apply_kernel(np.asarray(gate, dtype=dtype), np.asarray(state, dtype=dtype))
+
+
+if not GPU:
+	# Compile (or load from the on-disk cache) the DTYPE specialization at import
+	apply(IDENTITY, ZERO)
+
+
+def split_state(state: np.ndarray) -> tuple:
+	"""Split a complex state vector into contiguous real-valued (real, imag) arrays."""
+	# A (2, N) view such as state.view(np.float32).reshape(-1, 2).T avoids the copy,
+	# but its rows still stride over the interleaved re/im memory; apply_split()
+	# needs truly separate arrays to stream them through real matrix products.
+	return xp.ascontiguousarray(state.real), xp.ascontiguousarray(state.imag)
+
+
+def apply_split(gate: np.ndarray, state_re: np.ndarray, state_im: np.ndarray) -> tuple:
+	"""
+	Apply a gate to a state stored as separate real/imaginary float arrays.
+
+	(G_re + i G_im)(s_re + i s_im) is computed with real matrix products only.
+	Real gates (X, Z, H, CNOT, ...) skip the G_im terms, halving the work.
+	"""
+	gate_re, gate_im = gate.real, gate.imag
+	new_re = gate_re @ state_re
+	new_im = gate_re @ state_im
+	if xp.any(gate_im):
+		new_re -= gate_im @ state_im
+		new_im += gate_im @ state_re
+	return new_re, new_im
 
 
 if __name__ == "__main__":
-	print("|0> =\n", zero)
-	print("|1> =\n", one)
+	print("|0> =\n", ZERO)
+	print("|1> =\n", ONE)
 	print("CNOT when first qubit is the target and second is control: ")
-	print(cnot_1)
+	print(CNOT_1)
 	print("CNOT when second qubit is the target, and first is control: ")
-	print(cnot_2)
-	# print("Identity|0> =\n", apply(identity, zero))
-	# print("X|0> (should be |1>) =\n", apply(pauli_x, zero))
-	# print("Y|0> (phase-added |1>) =\n", apply(pauli_y, zero))
-	# print("Z|0> (unchanged) =\n", apply(pauli_z, zero))
-	# print("H|0> (superposition) =\n", apply(hadamard, zero))
-	# print("H|1> (superposition) =\n", apply(hadamard, one))
-	#print("CNOT|01> =\n", apply(cnot_1, np.kron(zero, one)))
-	print("CNOT|10> =\n", apply(cnot_2, np.kron(one, zero)))
\ No newline at end of file
+	print(CNOT_2)
+	# print("Identity|0> =\n", apply(IDENTITY, ZERO))
+	# print("X|0> (should be |1>) =\n", apply(PAULI_X, ZERO))
+	# print("Y|0> (phase-added |1>) =\n", apply(PAULI_Y, ZERO))
+	# print("Z|0> (unchanged) =\n", apply(PAULI_Z, ZERO))
+	# print("H|0> (superposition) =\n", apply(HADAMARD, ZERO))
+	# print("H|1> (superposition) =\n", apply(HADAMARD, ONE))
+	#print("CNOT|01> =\n", apply(CNOT_1, xp.kron(ZERO, ONE)))
+	print("CNOT|10> =\n", apply(CNOT_2, xp.kron(ONE, ZERO)))
\ No newline at end of file
@@ -1,8 +1,9 @@
 import numpy as np
+from backend import DTYPE  # complex64 unless changed in backend.py
 
 # Representing the computational basis states#
-zero = np.array([[1, 0]]).T 
-one = np.array([[0, 1]]).T
+zero = np.array([[1, 0]], dtype=DTYPE).T 
+one = np.array([[0, 1]], dtype=DTYPE).T
 
 print("State |0> is:") 
 print(zero)
@@ -16,14 +17,14 @@ print("Shape of state |1> is: ", one.shape)
 import numpy as np
 import math
 
-eq_superposition = np.array([[1/math.sqrt(2), 1/math.sqrt(2)]]).T
+eq_superposition = np.array([[1/math.sqrt(2), 1/math.sqrt(2)]], dtype=DTYPE).T
 
 print("Equal superposition state: ")
 print(eq_superposition)
 
 # Complex entries in the state vector
 
-complex_state = np.array([[1/math.sqrt(2), 1j/math.sqrt(2)]]).T #adding the 'j' for complex numbers
+complex_state = np.array([[1/math.sqrt(2), 1j/math.sqrt(2)]], dtype=DTYPE).T #adding the 'j' for complex numbers
 
 print("A state with complex-valued entries: ")
 print(complex_state)
@@ -31,8 +32,8 @@ print(complex_state)
 # Multi-qubit states
 import numpy as np
 
-q1 = np.array([[1, 0]]).T
-q2 = np.array([[1, 0]]).T
+q1 = np.array([[1, 0]], dtype=DTYPE).T
+q2 = np.array([[1, 0]], dtype=DTYPE).T
 
 system = np.kron(q1, q2) #tensor product of q1 and q2
 print("The system is in state: ")
@@ -42,9 +43,9 @@ print(system)
 
 import numpy as np
 
-q1 = np.array([[0, 1]]).T
-q2 = np.array([[1, 0]]).T
-q3 = np.array([[0, 1]]).T
+q1 = np.array([[0, 1]], dtype=DTYPE).T
+q2 = np.array([[1, 0]], dtype=DTYPE).T
+q3 = np.array([[0, 1]], dtype=DTYPE).T
 
 system = np.kron(q1, np.kron(q2, q3)) #tensor product of q1 and q2 and q3
 print("The system is in state: ")
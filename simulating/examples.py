@@ -12,10 +12,10 @@ from quantum_simulator import (
     get_ground_state,
     run_program,
     get_counts,
+    counts_to_json,
     visualize_results,
     parse_circuit_string
 )
-import json
 
 def example_1_bell_state():
     """
@@ -43,7 +43,7 @@ def example_1_bell_state():
     # Measure multiple times
     counts = get_counts(final_state, 1000)
     
-    print(f"Results:\n{counts}\n")
+    print(f"Results:\n{counts_to_json(counts)}\n")
     print("Expected: ~50% |00> and ~50% |11>\n")
 
 
@@ -66,7 +66,7 @@ def example_2_superposition():
     final_state = run_program(qpu, circuit)
     counts = get_counts(final_state, 1000)
     
-    print(f"Results:\n{counts}\n")
+    print(f"Results:\n{counts_to_json(counts)}\n")
     print("Expected: ~50% |0> and ~50% |1>\n")
 
 
@@ -91,7 +91,7 @@ def example_3_ghz_state():
     final_state = run_program(qpu, circuit)
     counts = get_counts(final_state, 2000)
     
-    print(f"Results:\n{counts}\n")
+    print(f"Results:\n{counts_to_json(counts)}\n")
     print("Expected: ~50% |000> and ~50% |111>\n")
 
 
@@ -115,7 +115,7 @@ def example_4_custom_gates():
     final_state = run_program(qpu, circuit)
     counts = get_counts(final_state, 1000)
     
-    print(f"Results:\n{counts}\n")
+    print(f"Results:\n{counts_to_json(counts)}\n")
     print("Expected: qubit 1 is always |1>, qubits 0 and 2 are in superposition")
     print("Should see: ~25% each of |010>, |110>, |011>, |111>\n")
 
@@ -141,7 +141,7 @@ def example_5_using_string_parser():
     final_state = run_program(qpu, circuit)
     counts = get_counts(final_state, 1000)
     
-    print(f"Results:\n{counts}\n")
+    print(f"Results:\n{counts_to_json(counts)}\n")
 
 
 def example_6_with_visualization():
@@ -161,13 +161,12 @@ def example_6_with_visualization():
     
     qpu = get_ground_state(2)
     final_state = run_program(qpu, circuit)
-    counts_json = get_counts(final_state, 1000)
-    counts_dict = json.loads(counts_json)
+    counts = get_counts(final_state, 1000)
     
-    print(f"Results:\n{counts_json}\n")
+    print(f"Results:\n{counts_to_json(counts)}\n")
     print("Generating visualization...")
     
-    visualize_results(counts_dict, final_state, 2)
+    visualize_results(counts, final_state, 2)
     print("Visualization saved to quantum_results.html\n")
 
 
@@ -192,7 +191,7 @@ def example_7_phase_gates():
     counts = get_counts(final_state, 1000)
     
     print("Circuit: H then S gate")
-    print(f"Results:\n{counts}")
+    print(f"Results:\n{counts_to_json(counts)}")
     print("Note: Probabilities unchanged (50/50), but relative phase is different!\n")
     
     # Now with T gate
@@ -201,7 +200,7 @@ def example_7_phase_gates():
     counts = get_counts(final_state, 1000)
     
     print("Circuit: H then T gate")
-    print(f"Results:\n{counts}")
+    print(f"Results:\n{counts_to_json(counts)}")
     print("Note: Again 50/50, but with π/4 phase instead of π/2\n")
 
 
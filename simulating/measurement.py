@@ -43,22 +43,34 @@ index = np.random.choice(a=len(state_vector), p=probabilities)
 print("Measured state: ", index)
 
 
-def measure(state_vector):
-    # choose element from state_vector using weighted random and return its index
-    probabilities = np.abs(state_vector.flatten())**2
-    index = np.random.choice(a=len(state_vector), p=probabilities)
+def prepare(state_vector):
+    # |amplitude|^2 of every basis state, normalized to a probability distribution.
+    # Computed once per state and reused by every measurement below
+    state = np.asarray(state_vector).ravel()
+    probabilities = state.real**2 + state.imag**2
+    return probabilities / probabilities.sum()
+
+def measure(probabilities):
+    # choose a basis state index using weighted random on the prepared distribution:
+    # invert the cumulative distribution at a uniform random point.
+    # Plain NumPy so np.random.seed() applies (Numba keeps its own generator)
+    cumulative = np.cumsum(probabilities)
+    index = np.searchsorted(cumulative, np.random.random() * cumulative[-1], side='right')
     return index
 
-zero_count = one_count = 0
+def sample_counts(probabilities, shots):
+    # measure `shots` times in one call and return how often each
+    # basis state was observed (histogram of length 2^n)
+    return np.random.multinomial(shots, probabilities)
+
 state_vector = np.array([[1, 0]]).T
 hadamard = np.array([[1/np.sqrt(2), 1/np.sqrt(2)],[1/np.sqrt(2), -1/np.sqrt(2)]])
 superposition = np.dot(hadamard, state_vector)
 
-for _ in range(1000):
-    result = measure(superposition) # measure the state and record the result
-    if result == 0:
-        zero_count +=1 
-    elif result == 1:
-        one_count += 1
+probabilities = prepare(superposition) # computed once for all measurements
+print("Single measurement: ", measure(probabilities))
+
+counts = sample_counts(probabilities, 1000) # measure the state 1000 times
+zero_count, one_count = counts[0], counts[1]
 
-print(f'0: {zero_count} | 1: {one_count}')      
\ No newline at end of file
+print(f'0: {zero_count} | 1: {one_count}')
\ No newline at end of file
@@ -21,13 +21,16 @@ Author: Quantum Computing Research
 Date: January 2026
 """
 
+import functools
+import os
 import numpy as np
 import json
 import argparse
-from collections import Counter
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+import _kernels
+
 # A dictionary containing the standard quantum gates as 2x2 unitary matrices
 # Gates supported:
 #   - I (Identity): Does nothing to the qubit
@@ -37,17 +40,40 @@ from plotly.subplots import make_subplots
 #   - Z (Pauli-Z): Phase flip, maps |1> to -|1>
 #   - S (Phase gate): Applies pi/2 phase rotation
 #   - T (pi/8 gate): Applies pi/4 phase rotation
+# All gates are complex128, so multiplying them never promotes int/float arrays;
+# run_program casts them to the state's precision (see PRECISIONS)
 gates = {
-    "i": np.identity(2),  # Identity gate
-    "h": np.array([[1/np.sqrt(2), 1/np.sqrt(2)], [1/np.sqrt(2), -1/np.sqrt(2)]]),  # Hadamard
-    "x": np.array([[0, 1], [1, 0]]),  # Pauli-X (NOT gate)
-    "y": np.array([[0, +1j], [-1j, 0]]),  # Pauli-Y
-    "z": np.array([[1, 0], [0, -1]]),  # Pauli-Z
-    "s": np.array([[1, 0], [0, np.exp(np.pi * +1j / 2)]]),  # Phase gate (sqrt(Z))
-    "t": np.array([[1, 0], [0, np.exp(np.pi * +1j / 4)]]),  # T gate (sqrt(S))
+    "i": np.identity(2, dtype=np.complex128),  # Identity gate
+    "h": np.array([[1/np.sqrt(2), 1/np.sqrt(2)], [1/np.sqrt(2), -1/np.sqrt(2)]], dtype=np.complex128),  # Hadamard
+    "x": np.array([[0, 1], [1, 0]], dtype=np.complex128),  # Pauli-X (NOT gate)
+    "y": np.array([[0, +1j], [-1j, 0]], dtype=np.complex128),  # Pauli-Y
+    "z": np.array([[1, 0], [0, -1]], dtype=np.complex128),  # Pauli-Z
+    "s": np.array([[1, 0], [0, np.exp(np.pi * +1j / 2)]], dtype=np.complex128),  # Phase gate (sqrt(Z))
+    "t": np.array([[1, 0], [0, np.exp(np.pi * +1j / 4)]], dtype=np.complex128),  # T gate (sqrt(S))
+}
+
+# Factors of the Kronecker chains in get_single_qubit_operator/get_cx_operator
+I = gates['i']
+P0x0 = np.array([[1, 0], [0, 0]], dtype=np.complex128)  # |0><0|
+P1x1 = np.array([[0, 0], [0, 1]], dtype=np.complex128)  # |1><1|
+
+def kron_chain(factors):
+    """Kronecker product of 2x2 factors, qubit 0 first (always a new array)."""
+    # Folding np.multiply.outer and transposing rows before columns avoids the
+    # intermediate np.kron results, but the strided transpose copy makes it ~2x
+    # slower (12 qubits: 0.30 s vs 0.16 s) and holds two 4^n arrays at its peak,
+    # where the np.kron chain holds the result plus a 4^(n-1) intermediate
+    return functools.reduce(np.kron, factors, np.ones((1, 1), dtype=np.complex128))
+
+# State precisions: single (complex64) halves the memory traffic of every gate,
+# which dominates for large states, at ~1e-7 relative rounding per amplitude;
+# enough for sampling and visualization
+PRECISIONS = {
+    'single': np.complex64,
+    'double': np.complex128,
 }
 
-def get_ground_state(num_qubits):
+def get_ground_state(num_qubits, dtype=np.complex128):
     """
     Initialize a quantum system in the ground state |00...0>.
     
@@ -56,19 +82,23 @@ def get_ground_state(num_qubits):
     
     Args:
         num_qubits (int): Number of qubits in the quantum system
+        dtype: Complex dtype of the state (np.complex64 or np.complex128);
+            run_program keeps the state in this precision
         
     Returns:
         numpy.ndarray: State vector of length 2^n representing |00...0>
         
     Example:
         >>> get_ground_state(2)
-        array([1, 0, 0, 0])  # Represents |00>
+        array([1.+0.j, 0.+0.j, 0.+0.j, 0.+0.j])  # Represents |00>
     """
-    vector = [0 for i in range(2**num_qubits)]
+    # Allocate directly in the simulation dtype (no Python list, no upcast later)
+    vector = np.zeros(2**num_qubits, dtype=dtype)
     vector[0] = 1  # Set the first amplitude to 1
-    return np.array(vector)
+    return vector
 
-def get_single_qubit_operator(total_qubits, gate, target):
+@functools.lru_cache(maxsize=128)
+def get_single_qubit_operator(total_qubits, gate_name, target):
     """
     Construct a full-system unitary operator for a single-qubit gate.
     
@@ -77,9 +107,12 @@ def get_single_qubit_operator(total_qubits, gate, target):
     The operator is built using tensor products (Kronecker products) of the gate
     and identity matrices.
     
+    Operators are cached by (total_qubits, gate_name, target), so a gate that is
+    repeated in a circuit is built only once; the cached matrix is read-only.
+    
     Args:
         total_qubits (int): Total number of qubits in the quantum system
-        gate (numpy.ndarray): The 2x2 unitary matrix of the gate to apply
+        gate_name (str): Name of the gate to apply (a key of `gates`, e.g. 'h')
         target (int): Index of the target qubit (0-indexed, where 0 is the first qubit)
         
     Returns:
@@ -89,19 +122,15 @@ def get_single_qubit_operator(total_qubits, gate, target):
         For a 2-qubit system applying H to qubit 0:
         Result is H tensor I (Hadamard tensor Identity)
     """
-    # Start tensor product with identity or the gate itself depending on target
-    operator = gate if target == 0 else gates['i']
+    gate = gates[gate_name]
 
-    for qubit in range(1, total_qubits):
-        if qubit == target:
-            # Tensor product with the gate
-            operator = np.kron(operator, gate)
-        else:
-            # Tensor product with identity
-            operator = np.kron(operator, gates['i'])
+    # Tensor product of the gate on the target qubit and identity everywhere else
+    operator = kron_chain([gate if qubit == target else I for qubit in range(total_qubits)])
     
+    operator.setflags(write=False)
     return operator
 
+@functools.lru_cache(maxsize=128)
 def get_cx_operator(total_qubits, control, target):
     """
     Construct a full-system CNOT (Controlled-NOT) gate operator.
@@ -116,6 +145,9 @@ def get_cx_operator(total_qubits, control, target):
     When control is |0>: target remains unchanged (identity applied)
     When control is |1>: target is flipped (X gate applied)
     
+    Operators are cached by (total_qubits, control, target); the cached matrix
+    is read-only.
+    
     Args:
         total_qubits (int): Total number of qubits in the system
         control (int): Index of the control qubit (0-indexed)
@@ -128,33 +160,19 @@ def get_cx_operator(total_qubits, control, target):
         For 2 qubits with control=0, target=1:
         |00> -> |00>, |01> -> |01>, |10> -> |11>, |11> -> |10>
     """
-    # Projection operators for |0> and |1> states
-    P0x0 = np.array([[1, 0], [0, 0]])  # |0><0|
-    P1x1 = np.array([[0, 0], [0, 1]])  # |1><1|
     X = gates['x']  # Pauli-X gate
 
     # Case 1: Control qubit is |0> -> apply identity to all qubits
-    operator1 = P0x0 if control == 0 else gates['i']
-
-    for qubit in range(1, total_qubits):
-        if qubit == control:
-            operator1 = np.kron(operator1, P0x0)
-        else:
-            operator1 = np.kron(operator1, gates['i'])
+    operator1 = kron_chain([P0x0 if qubit == control else I for qubit in range(total_qubits)])
 
     # Case 2: Control qubit is |1> -> apply X to target, identity to others
-    operator2 = P1x1 if control == 0 else gates['i']
-
-    for qubit in range(1, total_qubits):
-        if qubit == control:
-            operator2 = np.kron(operator2, P1x1)
-        elif qubit == target:
-            operator2 = np.kron(operator2, X)  # Apply X to target
-        else:
-            operator2 = np.kron(operator2, gates['i'])
+    operator2 = kron_chain([P1x1 if qubit == control else X if qubit == target else I
+                            for qubit in range(total_qubits)])
     
     # Combine both cases: CNOT = (control is 0 -> I) + (control is 1 -> X on target)
-    return operator1 + operator2
+    operator = operator1 + operator2
+    operator.setflags(write=False)
+    return operator
 
 def get_operator(total_qubits, gate_unitary, target_qubits):
     """
@@ -182,10 +200,160 @@ def get_operator(total_qubits, gate_unitary, target_qubits):
         return get_cx_operator(total_qubits, target_qubits[0], target_qubits[1])
     else:
         # Single-qubit gates require only one target qubit
-        return get_single_qubit_operator(total_qubits, gates[gate_unitary], target_qubits[0])
+        return get_single_qubit_operator(total_qubits, gate_unitary, target_qubits[0])
+
+
+def apply_single_qubit_gate(state, gate, target):
+    """
+    Apply a 2x2 gate to one qubit of a state stored as a (2, 2, ..., 2) tensor.
+    
+    Same result as multiplying by get_single_qubit_operator(), but only the
+    target axis is contracted (mixed-product property of the Kronecker product),
+    so the 2^n x 2^n operator is never built: O(2^n) memory and work per gate
+    instead of O(4^n).
+    
+    Args:
+        state (numpy.ndarray): State tensor of shape (2,) * n, axis k is qubit k
+        gate (numpy.ndarray): The 2x2 unitary matrix of the gate to apply
+        target (int): Index of the target qubit
+        
+    Returns:
+        numpy.ndarray: New state tensor of shape (2,) * n
+    """
+    # tensordot puts the gate's output axis first; move it back to the target position
+    return np.moveaxis(np.tensordot(gate, state, axes=[[1], [target]]), 0, target)
+
+def apply_cx(state, control, target):
+    """
+    Apply a CNOT gate to a state stored as a (2, 2, ..., 2) tensor.
+    
+    Only the half of the state where the control qubit is |1> changes: X on its
+    target axis just swaps the target = |0> and |1> amplitudes, so CNOT is a
+    pure permutation (a flip of that axis) with no matrix and no arithmetic.
+    
+    Args:
+        state (numpy.ndarray): State tensor of shape (2,) * n (updated in place)
+        control (int): Index of the control qubit
+        target (int): Index of the target qubit
+        
+    Returns:
+        numpy.ndarray: The updated state tensor
+    """
+    # Select the control = |1> slice; it has one axis less, so shift the target axis
+    control_one = [slice(None)] * state.ndim
+    control_one[control] = 1
+    control_one = tuple(control_one)
+    target_axis = target if target < control else target - 1
+
+    state[control_one] = np.flip(state[control_one], axis=target_axis)
+    return state
+
+
+def validate_program(program, num_qubits):
+    """
+    Check that every gate of a program fits an n-qubit register.
+    
+    The compiled kernels do not bounds-check their indices, so an out-of-range
+    qubit would write outside the state buffer; reject it here instead.
+    
+    Args:
+        program (list): List of gate instructions (see run_program)
+        num_qubits (int): Number of qubits n of the state
+        
+    Raises:
+        ValueError: If a target is not in 0 <= qubit < n, a CNOT does not have
+            exactly a control and a target, or its control equals its target
+    """
+    for instruction in program:
+        gate = instruction['gate']
+        targets = instruction['target']
+        expected = 2 if gate == 'cx' else 1
+        if len(targets) != expected:
+            raise ValueError(f"Gate '{gate}' expects {expected} qubit(s), got {targets}")
+        for qubit in targets:
+            if not 0 <= qubit < num_qubits:
+                raise ValueError(f"Qubit {qubit} of gate '{gate}' is out of range for {num_qubits} qubits")
+        if gate == 'cx' and targets[0] == targets[1]:
+            raise ValueError(f"CNOT control and target must differ, got {targets}")
+
+
+def fuse_gates(program):
+    """
+    Fuse consecutive single-qubit gates on the same qubit into one 2x2 matrix.
+    
+    Gates on a qubit are multiplied together (e.g. h, x, h -> H X H) until a
+    CNOT touches that qubit or the program ends, so each run of single-qubit
+    gates costs a single pass over the state.
+    
+    Args:
+        program (list): List of gate instructions (see run_program)
+        
+    Returns:
+        list: Operations in application order, either ('u', qubit, matrix)
+            for a fused single-qubit gate or ('cx', control, target)
+    """
+    operations = []
+    pending = {}  # qubit -> fused 2x2 matrix not yet applied
 
+    for instruction in program:
+        gate = instruction['gate']
+        targets = instruction['target']
+        if gate == 'cx':
+            for qubit in targets[:2]:
+                if qubit in pending:
+                    operations.append(('u', qubit, pending.pop(qubit)))
+            operations.append(('cx', targets[0], targets[1]))
+        else:
+            qubit = targets[0]
+            pending[qubit] = gates[gate] @ pending.get(qubit, I)
+
+    operations.extend(('u', qubit, matrix) for qubit, matrix in pending.items())
+    return operations
+
+# Where run_program keeps the state:
+#   - numpy: host memory (Numba kernels when installed, NumPy tensor ops otherwise)
+#   - cupy: GPU memory, same tensor ops as the NumPy path executed by CuPy
+#   - custatevec: GPU memory, gates applied in place by cuStateVec
+BACKENDS = ('numpy', 'cupy', 'custatevec')
+
+# get_counts samples a GPU state on the device above this many shots
+GPU_SAMPLING_SHOTS = 10**4
+
+def load_gpu_backend(backend):
+    """
+    Import backend.py with its GPU arrays enabled (CuPy, plus cuStateVec if installed).
+    
+    Raises:
+        RuntimeError: If backend.py was already imported for the CPU, or if
+            'custatevec' is requested without cuquantum-python installed
+    """
+    # backend.py selects CuPy/cuStateVec from QSIM_GPU when it is first imported
+    os.environ["QSIM_GPU"] = "1"
+    import backend as gpu
+    if not gpu.GPU:
+        raise RuntimeError("backend.py was already imported with QSIM_GPU=0")
+    if backend == 'custatevec' and gpu.cusv is None:
+        raise RuntimeError("the custatevec backend requires cuquantum-python")
+    return gpu
+
+def to_host(array):
+    """Copy a CuPy array back to host memory (NumPy arrays are returned unchanged)."""
+    return array.get() if hasattr(array, 'get') else array
 
-def run_program(initial_state, program):
+def get_probabilities(state_vector):
+    """
+    Born rule probabilities P = |alpha|^2 of every basis state.
+    
+    Computed as real^2 + imag^2, which skips the square root that
+    np.abs(state)**2 takes and then squares again. Works for CuPy arrays too
+    (the result stays on the device).
+    """
+    if not hasattr(state_vector, 'get'):
+        # Lists and other array-likes, as np.abs() accepted them
+        state_vector = np.asarray(state_vector)
+    return state_vector.real**2 + state_vector.imag**2
+
+def run_program(initial_state, program, backend='numpy', return_probabilities=False):
     """
     Execute a quantum circuit by sequentially applying gates to the quantum state.
     
@@ -201,9 +369,16 @@ def run_program(initial_state, program):
         program (list): List of gate instructions, each a dict with:
             - 'gate' (str): Gate name ('h', 'x', 'cx', etc.)
             - 'target' (list): Target qubit indices
+        backend (str): One of BACKENDS. On the GPU backends the state stays in
+            device memory for the whole circuit and is returned there; use
+            to_host() to copy it back
+        return_probabilities (bool): Also return the measurement probabilities,
+            so get_counts/visualize_results do not recompute them
             
     Returns:
         numpy.ndarray: Final quantum state vector after all gates are applied
+            (a CuPy array for the GPU backends). With return_probabilities, a
+            (state, probabilities) tuple
         
     Example:
         >>> program = [
@@ -214,23 +389,194 @@ def run_program(initial_state, program):
         >>> final = run_program(initial, program)
     """
     total_qubits = int(np.log2(len(initial_state)))
+    validate_program(program, total_qubits)
+    # Simulate in the precision of the initial state (complex128 for real input)
+    dtype = np.result_type(initial_state, np.complex64)
+
+    if backend == 'cupy':
+        # The NumPy helpers below dispatch to CuPy for device arrays; only the
+        # fused 2x2 matrices are copied to the device, never the state
+        xp = load_gpu_backend(backend).xp
+        state = xp.asarray(initial_state, dtype=dtype).reshape((2,) * total_qubits)
+
+        def apply_gate(state, gate, qubit):
+            return apply_single_qubit_gate(state, xp.asarray(gate, dtype=state.dtype), qubit)
 
-    state = initial_state
+        apply_cnot = apply_cx
+    elif backend == 'custatevec':
+        # Flat device state updated in place by cuStateVec (backend.apply_matrix)
+        gpu = load_gpu_backend(backend)
+        state = gpu.xp.asarray(initial_state, dtype=dtype)
+        cnot = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 0, 1], [0, 0, 1, 0]])  # first qubit control
+
+        def apply_gate(state, gate, qubit):
+            return gpu.apply_matrix(gate, state, [qubit], total_qubits)
+
+        def apply_cnot(state, control, target):
+            return gpu.apply_matrix(cnot, state, [control, target], total_qubits)
+    elif _kernels.NUMBA:
+        # Flat state updated in place by the compiled, multithreaded kernels
+        # (_kernels.py); they index bits from the least significant one
+        state = np.array(initial_state, dtype=dtype)
+
+        def apply_gate(state, gate, qubit):
+            _kernels.apply_gate(state, gate, total_qubits - 1 - qubit)
+            return state
+
+        def apply_cnot(state, control, target):
+            _kernels.apply_cx(state, total_qubits - 1 - control, total_qubits - 1 - target)
+            return state
+    else:
+        # Keep the state as a (2, 2, ..., 2) tensor (axis k = qubit k) so every gate
+        # only touches its own axes; get_operator() builds the equivalent full
+        # 2^n x 2^n matrices, which cost O(4^n) per gate
+        state = np.array(initial_state, dtype=dtype).reshape((2,) * total_qubits)
+
+        def apply_gate(state, gate, qubit):
+            return apply_single_qubit_gate(state, gate.astype(dtype), qubit)
+
+        apply_cnot = apply_cx
     
-    # Apply each gate instruction sequentially
-    # For each instruction:
-    #   1. Get the full-system matrix operator for the gate
-    #   2. Apply it to the current state vector (matrix-vector multiplication)
-    #   3. Continue to next instruction
-    for instruction in program: 
-        gate = instruction['gate']
-        targets = instruction['target']
-        operator = get_operator(total_qubits, gate, targets)
-        state = np.dot(operator, state)  # |psi_new> = U|psi_old>
+    # Apply each (fused) gate sequentially: |psi_new> = U|psi_old>
+    for operation in fuse_gates(program):
+        if operation[0] == 'cx':
+            state = apply_cnot(state, operation[1], operation[2])
+        else:
+            state = apply_gate(state, operation[2], operation[1])
 
+    # Back to a flat state vector of length 2^n for measurement
+    state = state.reshape(-1)
+    if return_probabilities:
+        return state, get_probabilities(state)
     return state
 
-def measure_all(state_vector):
+def run_program_batch(initial_states, program):
+    """
+    Execute the same quantum circuit on a batch of initial states at once.
+    
+    The B states are stored as one (B, 2, 2, ..., 2) tensor: axis 0 indexes
+    the batch and axis k + 1 is qubit k. Every (fused) gate is applied to all
+    states in a single tensordot / flip, so the batch costs one sweep per gate
+    instead of B calls to run_program.
+    
+    Args:
+        initial_states (numpy.ndarray): Initial states, shape (B, 2^n)
+        program (list): List of gate instructions (see run_program)
+        
+    Returns:
+        numpy.ndarray: Final state vectors, shape (B, 2^n)
+        
+    Example:
+        >>> initial = np.stack([get_ground_state(2), np.roll(get_ground_state(2), 2)])
+        >>> final = run_program_batch(initial, [{"gate": "h", "target": [0]}])
+    """
+    batch_size, dim = np.shape(initial_states)
+    total_qubits = int(np.log2(dim))
+    validate_program(program, total_qubits)
+    dtype = np.result_type(initial_states, np.complex64)
+    state = np.array(initial_states, dtype=dtype).reshape((batch_size,) + (2,) * total_qubits)
+
+    # Same helpers as the single-state tensor path, shifted past the batch axis
+    for operation in fuse_gates(program):
+        if operation[0] == 'cx':
+            state = apply_cx(state, operation[1] + 1, operation[2] + 1)
+        else:
+            state = apply_single_qubit_gate(state, operation[2].astype(dtype), operation[1] + 1)
+
+    return state.reshape(batch_size, dim)
+
+def compile_circuit(program, num_qubits):
+    """
+    Compile a circuit into one specialized function, for programs run many times.
+    
+    Python source is generated for the exact (fused) gate sequence, with the
+    gate entries and bit positions written in as constants, then executed and
+    compiled with Numba. Running the circuit then has no per-gate Python
+    dispatch at all. Compiled circuits are cached by (program, num_qubits).
+    Without Numba the returned function simply calls run_program.
+    
+    Args:
+        program (list): List of gate instructions (see run_program)
+        num_qubits (int): Number of qubits n
+        
+    Returns:
+        callable: run(initial_state) -> final state vector. initial_state is a
+            complex state vector of length 2^n (e.g. from get_ground_state)
+            and is not modified; run raises ValueError for any other length
+            
+    Raises:
+        ValueError: If the program does not fit num_qubits (see validate_program)
+            
+    Example:
+        >>> run = compile_circuit(parse_circuit_string("h:0,cx:0-1"), 2)
+        >>> final = run(get_ground_state(2))
+    """
+    validate_program(program, num_qubits)
+    key = tuple((instruction['gate'], tuple(instruction['target'])) for instruction in program)
+    return _compile_circuit(key, num_qubits)
+
+@functools.lru_cache(maxsize=32)
+def _compile_circuit(key, num_qubits):
+    program = [{"gate": gate, "target": list(targets)} for gate, targets in key]
+    dim = 2**num_qubits
+    if not _kernels.NUMBA:
+        def run(initial_state):
+            if len(initial_state) != dim:
+                raise ValueError(f"initial_state must have length 2^{num_qubits}")
+            return run_program(initial_state, program)
+        return run
+
+    # The kernels index bits from the least significant one: bit = n - 1 - qubit
+    lines = [
+        "def run(initial_state):",
+        f"    if initial_state.shape[0] != {dim}:",
+        f"        raise ValueError('initial_state must have length 2^{num_qubits}')",
+        "    state = initial_state.copy()",
+    ]
+    for operation in fuse_gates(program):
+        if operation[0] == 'cx':
+            lines.append(f"    apply_cx(state, {num_qubits - 1 - operation[1]}, {num_qubits - 1 - operation[2]})")
+            continue
+        bit = num_qubits - 1 - operation[1]
+        g00, g01, g10, g11 = (complex(g) for g in operation[2].ravel())
+        if g01 == 0 and g10 == 0:
+            lines.append(f"    apply_diagonal(state, {g00!r}, {g11!r}, {bit})")
+        else:
+            lines.append(f"    apply_1q(state, {g00!r}, {g01!r}, {g10!r}, {g11!r}, {bit})")
+    lines.append("    return state")
+
+    namespace = {
+        "apply_1q": _kernels.apply_1q,
+        "apply_diagonal": _kernels.apply_diagonal,
+        "apply_cx": _kernels.apply_cx,
+    }
+    exec("\n".join(lines), namespace)
+    return _kernels.njit(namespace["run"])
+
+def bit_labels(indices, num_bits):
+    """
+    Little-endian bit-string labels of basis state indices: character k is
+    bit k of the index, e.g. index 1 with 2 qubits -> "10".
+    
+    All labels are built in one vectorized step (bit extraction + a fixed-width
+    byte view) instead of formatting and reversing a string per index.
+    
+    Args:
+        indices (numpy.ndarray): Integer basis state indices
+        num_bits (int): Number of qubits n
+        
+    Returns:
+        list: One label string per index
+    """
+    bits = ((np.asarray(indices)[:, None] >> np.arange(num_bits)) & 1).astype(np.uint8)
+    return [label.decode() for label in (bits + ord('0')).view(f'S{num_bits}').ravel()]
+
+@functools.lru_cache(maxsize=8)
+def basis_labels(num_qubits):
+    """Labels of all 2^n basis states in index order, built once per n (read-only tuple)."""
+    return tuple(bit_labels(np.arange(2**num_qubits), num_qubits))
+
+def measure_all(state_vector, probabilities=None):
     """
     Perform a measurement of all qubits in the computational basis.
     
@@ -243,6 +589,8 @@ def measure_all(state_vector):
     
     Args:
         state_vector (numpy.ndarray): Quantum state vector of length 2^n
+        probabilities (numpy.ndarray): Optional precomputed probabilities
+            (from run_program(..., return_probabilities=True))
         
     Returns:
         int: Index of the measured state in the computational basis
@@ -253,14 +601,19 @@ def measure_all(state_vector):
         with equal probability (50% each)
     """
     # Calculate measurement probabilities using Born rule: P = |psi|^2
-    probabilities = np.abs(state_vector)**2
+    if probabilities is None:
+        probabilities = get_probabilities(state_vector)
+    # float64 and renormalized: single-precision probabilities do not sum to 1
+    # closely enough for np.random.choice
+    probabilities = to_host(probabilities).astype(np.float64)
+    probabilities /= probabilities.sum()
     
     # Randomly select a state according to probability distribution
     index = np.random.choice(a=len(state_vector), p=probabilities)
 
     return index
 
-def get_counts(state_vector, num_shots):
+def get_counts(state_vector, num_shots, probabilities=None):
     """
     Simulate multiple measurements to estimate the probability distribution.
     
@@ -272,11 +625,14 @@ def get_counts(state_vector, num_shots):
     is qubit 0), matching common quantum computing conventions.
     
     Args:
-        state_vector (numpy.ndarray): Quantum state vector of length 2^n
+        state_vector (numpy.ndarray): Quantum state vector of length 2^n (a CuPy
+            array is sampled on the GPU when num_shots > GPU_SAMPLING_SHOTS)
         num_shots (int): Number of measurements to perform
+        probabilities (numpy.ndarray): Optional precomputed probabilities
+            (from run_program(..., return_probabilities=True))
         
     Returns:
-        str: JSON string containing measurement statistics in format:
+        dict: Measurement statistics sorted by outcome, in format:
             {
                 "00": count1,
                 "01": count2,
@@ -284,29 +640,67 @@ def get_counts(state_vector, num_shots):
                 "11": count4,
                 ...
             }
-            where keys are bit strings (little-endian) and values are frequencies
+            where keys are bit strings (little-endian) and values are frequencies.
+            Outcomes that were never measured are omitted. Use counts_to_json()
+            for printable output
             
     Example:
         For Bell state (|00> + |11>)/sqrt(2) with 1000 shots:
         {"00": 503, "11": 497}  (approximately 50/50 distribution)
     """
-    results = []
-    
     num_bits = int(np.log2(len(state_vector)))
-    
-    # Perform num_shots measurements
-    for _ in range(num_shots):
-        result = measure_all(state_vector)
-        # Convert index to binary string and reverse for little-endian format
-        # e.g., index 3 with 2 qubits -> "11" -> "11" (qubit 0 on right)
-        results.append("{0:b}".format(result).zfill(num_bits)[::-1]) 
+    if probabilities is None:
+        probabilities = get_probabilities(state_vector)
+    
+    if hasattr(state_vector, 'get') and num_shots > GPU_SAMPLING_SHOTS:
+        # GPU state and many shots: sample on the device. Every shot inverts the
+        # cumulative distribution at a uniform random point, all in parallel;
+        # only the outcomes that occurred and their counts are copied back
+        import cupy as xp
+        # Running sum in float64, as on the host: a float32 sum over 2^20+
+        # entries drifts and skews the sampled distribution
+        cumulative = xp.cumsum(probabilities, dtype=xp.float64)
+        points = xp.random.random(num_shots) * cumulative[-1]
+        shots = xp.minimum(xp.searchsorted(cumulative, points, side='right'), len(state_vector) - 1)
+        counts = xp.bincount(shots, minlength=len(state_vector))
+        outcomes = xp.flatnonzero(counts)
+        outcome_counts = counts[outcomes].get()
+        outcomes = outcomes.get()
+    else:
+        # Born rule probabilities, normalized once for all shots
+        # (for GPU states only the 2^n probabilities are copied back)
+        # Normalize in float64: single-precision probabilities can sum past 1.0
+        # by rounding, which rng.multinomial rejects
+        probabilities = to_host(probabilities).astype(np.float64)
+        probabilities /= probabilities.sum()
+        
+        # Perform all num_shots measurements in a single draw:
+        # counts[i] is how often basis state i was measured
+        rng = np.random.default_rng()
+        counts = rng.multinomial(num_shots, probabilities)
+        outcomes = np.flatnonzero(counts)
+        outcome_counts = counts[outcomes]
+
+    # Label only the outcomes that occurred (at most 2^n, usually far fewer
+    # than shots; cheaper than building basis_labels() for large n)
+    labels = bit_labels(outcomes, num_bits)
 
     # Count occurrences of each outcome
-    stats = Counter(results)   
+    return {label: int(count) for label, count in sorted(zip(labels, outcome_counts))}
 
-    return json.dumps(stats, sort_keys=True, indent=4)
+def counts_to_json(counts):
+    """
+    Format measurement counts from get_counts() as an indented JSON string.
+    
+    Args:
+        counts (dict): Measurement outcome -> frequency
+        
+    Returns:
+        str: JSON string with the outcomes sorted, e.g. '{\n    "00": 503, ...'
+    """
+    return json.dumps(counts, sort_keys=True, indent=4)
 
-def visualize_results(counts_dict, state_vector, num_qubits):
+def visualize_results(counts_dict, state_vector, num_qubits, probabilities=None):
     """
     Create interactive visualizations of quantum circuit results using Plotly.
     
@@ -317,16 +711,15 @@ def visualize_results(counts_dict, state_vector, num_qubits):
     
     Args:
         counts_dict (dict): Dictionary of measurement outcomes and their frequencies
+            (as returned by get_counts)
         state_vector (numpy.ndarray): Final quantum state vector
         num_qubits (int): Number of qubits in the system
+        probabilities (numpy.ndarray): Optional precomputed probabilities
+            (from run_program(..., return_probabilities=True))
         
     Returns:
         None (displays plots and saves to HTML file)
     """
-    # Parse counts from JSON if necessary
-    if isinstance(counts_dict, str):
-        counts_dict = json.loads(counts_dict)
-    
     # Create subplots with 2 rows and 2 columns
     fig = make_subplots(
         rows=2, cols=2,
@@ -358,7 +751,7 @@ def visualize_results(counts_dict, state_vector, num_qubits):
     )
     
     # Plot 2: State vector amplitudes (real and imaginary parts)
-    basis_states = [format(i, f'0{num_qubits}b')[::-1] for i in range(2**num_qubits)]
+    basis_states = list(basis_labels(num_qubits))
     real_parts = np.real(state_vector)
     imag_parts = np.imag(state_vector)
     
@@ -383,7 +776,8 @@ def visualize_results(counts_dict, state_vector, num_qubits):
     )
     
     # Plot 3: Theoretical probabilities
-    probabilities = np.abs(state_vector)**2
+    if probabilities is None:
+        probabilities = get_probabilities(state_vector)
     
     fig.add_trace(
         go.Bar(
@@ -398,11 +792,12 @@ def visualize_results(counts_dict, state_vector, num_qubits):
     )
     
     # Plot 4: Comparison between theoretical and measured
-    measured_probs = {state: 0 for state in basis_states}
+    # Measured frequencies aligned with basis_states: labels are little-endian,
+    # so the basis state index is the reversed label read as binary
+    measured_prob_values = np.zeros(2**num_qubits)
     for state, count in counts_dict.items():
-        measured_probs[state] = count / total_shots
-    
-    measured_prob_values = [measured_probs[state] for state in basis_states]
+        measured_prob_values[int(state[::-1], 2)] = count
+    measured_prob_values /= total_shots
     
     fig.add_trace(
         go.Scatter(
@@ -569,6 +964,20 @@ Available Gates:
         help='Generate and display Plotly visualizations of results'
     )
     
+    parser.add_argument(
+        '--backend', '-b',
+        choices=BACKENDS,
+        default='numpy',
+        help='Where to simulate the state: numpy (CPU), cupy or custatevec (GPU) (default: numpy)'
+    )
+    
+    parser.add_argument(
+        '--precision', '-p',
+        choices=sorted(PRECISIONS),
+        default='double',
+        help='Floating-point precision of the state: single (complex64) or double (complex128) (default: double)'
+    )
+    
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -605,34 +1014,41 @@ Available Gates:
     
     # Create quantum computer (initialize qubits in ground state)
     print(f"\n🚀 Initializing {args.qubits}-qubit quantum system in state |{'0'*args.qubits}>...")
-    my_qpu = get_ground_state(args.qubits)
+    my_qpu = get_ground_state(args.qubits, dtype=PRECISIONS[args.precision])
     
     # Run circuit
     print(f"⚡ Executing quantum circuit...")
-    final_state = run_program(my_qpu, my_circuit)
+    try:
+        final_state, probabilities = run_program(my_qpu, my_circuit, backend=args.backend,
+                                                 return_probabilities=True)
+    except ValueError as e:
+        print(f"\n❌ Invalid circuit: {e}")
+        return
+    except (ImportError, RuntimeError) as e:
+        print(f"\n❌ Backend '{args.backend}' is not available: {e}")
+        return
     
     if args.verbose:
         print(f"\n📊 Final State Vector:")
-        basis_states = [format(i, f'0{args.qubits}b')[::-1] for i in range(2**args.qubits)]
-        for i, (basis, amplitude) in enumerate(zip(basis_states, final_state)):
-            if abs(amplitude) > 1e-10:  # Only show non-zero amplitudes
+        basis_states = basis_labels(args.qubits)
+        for basis, amplitude, prob in zip(basis_states, to_host(final_state), to_host(probabilities)):
+            if prob > 1e-20:  # Only show non-zero amplitudes (|amplitude| > 1e-10)
                 real = np.real(amplitude)
                 imag = np.imag(amplitude)
-                prob = abs(amplitude)**2
                 print(f"   |{basis}>: ({real:+.4f} {imag:+.4f}j) -> P = {prob:.4f}")
     
     # Perform measurements
     print(f"\n🎲 Performing {args.shots} measurements...")
-    counts = get_counts(final_state, args.shots)
+    counts = get_counts(final_state, args.shots, probabilities)
     
     # Display results
     print(f"\n📈 Measurement Results:")
-    print(counts)
+    print(counts_to_json(counts))
     
     # Generate visualization if requested
     if args.visualize:
         print(f"\n🎨 Generating visualizations...")
-        visualize_results(counts, final_state, args.qubits)
+        visualize_results(counts, to_host(final_state), args.qubits, to_host(probabilities))
     
     print("\n" + "=" * 70)
     print("✅ Simulation completed successfully!".center(70))
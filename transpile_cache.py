@@ -0,0 +1,109 @@
+"""
+Transpile cache for the Qiskit example scripts.
+
+Transpiling small circuits for AerSimulator often costs more than simulating
+them. transpile_cached() keys every circuit by a hash of its definition and
+the backend name, keeps the compiled circuit in memory and persists it to a
+pickle file, so later runs of the same script (or repeated oracle calls in a
+parameter sweep) skip the transpiler entirely.
+
+Usage:
+    from transpile_cache import transpile_cached
+    compiled = transpile_cached(circuit, simulator)
+"""
+
+import hashlib
+import os
+import pickle
+
+import qiskit
+from qiskit import transpile
+from qiskit.circuit.library import get_standard_gate_name_mapping
+
+# Cache file shared by all scripts in the repository
+CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".transpile_cache.pkl")
+
+# Standard gates are fully described by name and parameters; anything else
+# (custom gates such as "DJ-Oracle", initialize, ...) is hashed through its definition
+_STANDARD_GATES = set(get_standard_gate_name_mapping())
+
+# In-memory caches, one per cache file
+_caches = {}
+
+
+def circuit_fingerprint(circuit):
+    """
+    Build a hashable, deterministic description of a circuit.
+
+    Circuit and register names are ignored (Qiskit auto-generates them), so two
+    circuits built the same way in different runs get the same fingerprint.
+
+    Args:
+        circuit (QuantumCircuit): Circuit to describe
+
+    Returns:
+        tuple: Nested tuple of (name, params, qubits, clbits, definition) per instruction
+    """
+    instructions = []
+    for instruction in circuit.data:
+        operation = instruction.operation
+        definition = None
+        if operation.name not in _STANDARD_GATES and getattr(operation, "definition", None) is not None:
+            definition = circuit_fingerprint(operation.definition)
+        instructions.append((
+            operation.name,
+            tuple(str(param) for param in operation.params),
+            tuple(circuit.find_bit(qubit).index for qubit in instruction.qubits),
+            tuple(circuit.find_bit(clbit).index for clbit in instruction.clbits),
+            definition,
+        ))
+    return (circuit.num_qubits, circuit.num_clbits, tuple(instructions))
+
+
+def circuit_key(circuit, backend):
+    """Cache key for a circuit compiled for a given backend."""
+    digest = hashlib.sha256(repr(circuit_fingerprint(circuit)).encode()).hexdigest()
+    return f"{qiskit.__version__}:{backend.name}:{digest}"
+
+
+def _load_cache(cache_file):
+    cache_file = os.path.abspath(cache_file)
+    if cache_file not in _caches:
+        cache = {}
+        if os.path.exists(cache_file):
+            try:
+                with open(cache_file, "rb") as f:
+                    cache = pickle.load(f)
+            except Exception:
+                # Unreadable or stale cache file: start from an empty cache
+                cache = {}
+        _caches[cache_file] = cache
+    return _caches[cache_file]
+
+
+def transpile_cached(circuit, backend, cache_file=CACHE_FILE):
+    """
+    Transpile a circuit for a backend, reusing a previously compiled version.
+
+    Args:
+        circuit (QuantumCircuit): Circuit to compile
+        backend (Backend): Target backend (e.g. AerSimulator())
+        cache_file (str): Pickle file used to persist the cache between runs
+
+    Returns:
+        QuantumCircuit: Compiled circuit, named like the input circuit so
+            result.get_counts(circuit) keeps working
+    """
+    cache = _load_cache(cache_file)
+    key = circuit_key(circuit, backend)
+
+    if key not in cache:
+        # These circuits are tiny, so the optimization passes gain nothing
+        cache[key] = transpile(circuit, backend, optimization_level=0)
+        try:
+            with open(cache_file, "wb") as f:
+                pickle.dump(cache, f)
+        except OSError:
+            pass  # Read-only checkout: keep the in-memory cache only
+
+    return cache[key].copy(name=circuit.name)